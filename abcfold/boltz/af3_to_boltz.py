@@ -1,23 +1,66 @@
+import hashlib
 import json
 import logging
-import random
-import string
 from pathlib import Path
 from typing import Dict, List, Optional, Union
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 DELIM = "      "
+# Precomputed double indent so the per-line f-strings join two fragments
+# instead of three
+DOUBLE_DELIM = DELIM * 2
+
+# File size above which the input json is stream-parsed rather than
+# loaded in one go; json.load is faster for typical small inputs
+STREAM_JSON_THRESHOLD = 64 * 1024 * 1024
 
 logger = logging.getLogger("logger")
 
 
+def load_input_json(json_file: Union[str, Path]) -> dict:
+    """
+    Load an AlphaFold3 json file, streaming the parse for very large files
+
+    Large multimer inputs can embed whole MSAs in the json; when ijson is
+    available and the file is above STREAM_JSON_THRESHOLD, only the keys
+    used for the conversion are kept rather than materialising the full
+    dict in one shot
+
+    Args:
+        json_file (Union[str, Path]): json file path
+
+    Returns:
+        dict: the parsed json contents
+    """
+    json_file = Path(json_file)
+    if ijson is not None and json_file.stat().st_size > STREAM_JSON_THRESHOLD:
+        wanted = ("modelSeeds", "sequences", "bondedAtomPairs")
+        with open(json_file, "rb") as f:
+            return {key: value for key, value in ijson.kvitems(f, "") if key in wanted}
+    if orjson is not None:
+        return orjson.loads(json_file.read_bytes())
+    with open(json_file, "r") as f:
+        return json.load(f)
+
+
 class BoltzYaml:
     """
     Object to convert an AlphaFold3 json file to a boltzmann yaml file.
     """
 
     def __init__(self, working_dir: Union[str, Path], create_files: bool = True):
-        self.working_dir = working_dir
+        self.working_dir = Path(working_dir)
         self.yaml_string: str = ""
+        self._parts: List[str] = []
         self.msa_file: Optional[Union[str, Path]] = "null"
         self.seeds: list = [42]
         self.__ids: List[Union[str, int]] = []
@@ -26,6 +69,8 @@ class BoltzYaml:
         self.__create_files = create_files
         self.__non_ligands: List[str] = []
         self.__id_buffer: dict = {}
+        self.__written_msas: set = set()
+        self.__checked_msas: set = set()
 
     @property
     def chain_ids(self) -> List[Union[str, int]]:
@@ -64,17 +109,19 @@ class BoltzYaml:
             str: a string representation of string
         """
         if isinstance(json_file_or_dict, str) or isinstance(json_file_or_dict, Path):
-            with open(json_file_or_dict, "r") as f:
-                json_dict = json.load(f)
+            json_dict = load_input_json(json_file_or_dict)
         else:
             json_dict = json_file_or_dict
 
         self.get_ids(json_dict["sequences"])
 
-        self.yaml_string = ""
-        bonded_atom_string = ""
+        # Fragments are collected in a list and joined once at the end;
+        # repeated string concatenation is quadratic on large inputs
+        parts: List[str] = [self.add_version_number("1")]
+
+        sequences_header_written = False
+        constraints_header_written = False
 
-        self.yaml_string += self.add_version_number("1")
         for key, value in json_dict.items():
             if key == "modelSeeds":
                 if isinstance(value, list):
@@ -82,26 +129,30 @@ class BoltzYaml:
                 elif isinstance(value, int):
                     self.seeds = [value]
             if key == "sequences":
-                if "sequences" not in self.yaml_string:
-                    self.yaml_string += self.add_non_indented_string("sequences")
+                if not sequences_header_written:
+                    parts.append(self.add_non_indented_string("sequences"))
+                    sequences_header_written = True
                 for sequence_dict in value:
                     if any([key in sequence_dict for key in ["protein", "rna", "dna"]]):
-                        self.yaml_string += self.sequence_to_yaml(sequence_dict)
+                        parts.append(self.sequence_to_yaml(sequence_dict))
                     if any([key in sequence_dict for key in ["ligand"]]):
-                        self.yaml_string += self.add_ligand_information(
-                            sequence_dict["ligand"]
+                        parts.append(
+                            self.add_ligand_information(sequence_dict["ligand"])
                         )
             if key == "bondedAtomPairs" and isinstance(value, list):
 
-                bonded_atom_string += self.bonded_atom_pairs_to_yaml(value)
-                if "constraints" not in self.yaml_string and bonded_atom_string:
-                    self.yaml_string += self.add_non_indented_string("constraints")
-                self.yaml_string += bonded_atom_string
+                bonded_atom_string = self.bonded_atom_pairs_to_yaml(value)
+                if not constraints_header_written and bonded_atom_string:
+                    parts.append(self.add_non_indented_string("constraints"))
+                    constraints_header_written = True
+                parts.append(bonded_atom_string)
 
+        self._parts = parts
+        self.yaml_string = "".join(parts)
         return self.yaml_string
 
     def bonded_atom_pairs_to_yaml(self, bonded_atom_pairs: list):
-        yaml_string = ""
+        parts: List[str] = []
         # counter = 0
         for pair in bonded_atom_pairs:
             atom1, atom2 = pair  # each atom is [chain_id, residue_number, atom_name]
@@ -129,11 +180,11 @@ class BoltzYaml:
                 else:
                     atom1 = [first, 1, atom1[2]]
                     atom2 = [second, 2, atom2[2]]
-            yaml_string += self.add_title("bond")
-            yaml_string += self.add_key_and_value("atom1", atom1)
-            yaml_string += self.add_key_and_value("atom2", atom2)
+            parts.append(self.add_title("bond"))
+            parts.append(self.add_key_and_value("atom1", atom1))
+            parts.append(self.add_key_and_value("atom2", atom2))
 
-        return yaml_string
+        return "".join(parts)
 
     def add_version_number(self, version: str):
         """
@@ -176,9 +227,9 @@ class BoltzYaml:
             new_id = str(id_).replace('"', "").replace("'", "")
 
         return (
-            f"{DELIM}{DELIM}id: {new_id}\n"
+            f"{DOUBLE_DELIM}id: {new_id}\n"
             if not isinstance(id_, list)
-            else f"{DELIM}{DELIM}id: [{new_id}]\n"
+            else f"{DOUBLE_DELIM}id: [{new_id}]\n"
         )
 
     def add_sequence(self, sequence: str):
@@ -192,7 +243,7 @@ class BoltzYaml:
             str: yaml string
 
         """
-        return f"{DELIM}{DELIM}sequence: {sequence}\n"
+        return f"{DOUBLE_DELIM}sequence: {sequence}\n"
 
     def add_msa(self, msa: Union[str, Path]):
         """
@@ -204,11 +255,15 @@ class BoltzYaml:
         Returns:
             str: yaml string
         """
-        if not Path(msa).exists() and self.__create_files:
-            msg = f"File {msa} does not exist"
-            logger.critical(msg)
-            raise FileNotFoundError()
-        return f"{DELIM}{DELIM}msa: {msa}\n"
+        # Homomeric chains reference the same msa file; only stat each
+        # unique path once
+        if msa not in self.__checked_msas:
+            if not Path(msa).exists() and self.__create_files:
+                msg = f"File {msa} does not exist"
+                logger.critical(msg)
+                raise FileNotFoundError()
+            self.__checked_msas.add(msa)
+        return f"{DOUBLE_DELIM}msa: {msa}\n"
 
     def add_modifications(self, list_of_modifications: list):
         """
@@ -220,21 +275,20 @@ class BoltzYaml:
         Returns:
             str: yaml string
         """
-        yaml_string = ""
-        yaml_string += f"{DELIM}{DELIM}modifications:\n"
+        parts: List[str] = [f"{DOUBLE_DELIM}modifications:\n"]
         for modification in list_of_modifications:
             if "ptmType" in modification and "ptmPosition" in modification:
-                yaml_string += (
-                    f"{DELIM}{DELIM}{DELIM}- position: {modification['ptmPosition']}\n"
-                    f"{DELIM}{DELIM}{DELIM}  ccd: {modification['ptmType']}\n"
+                parts.append(
+                    f"{DOUBLE_DELIM}{DELIM}- position: {modification['ptmPosition']}\n"
+                    f"{DOUBLE_DELIM}{DELIM}  ccd: {modification['ptmType']}\n"
                 )
             elif "modificationType" in modification and "basePosition" in modification:
-                yaml_string += (
-                    f"{DELIM}{DELIM}{DELIM}- position: {modification['basePosition']}\n"
-                    f"{DELIM}{DELIM}{DELIM}  ccd: {modification['modificationType']}\n"
+                parts.append(
+                    f"{DOUBLE_DELIM}{DELIM}- position: {modification['basePosition']}\n"
+                    f"{DOUBLE_DELIM}{DELIM}  ccd: {modification['modificationType']}\n"
                 )
 
-        return yaml_string
+        return "".join(parts)
 
     def add_key_and_value(self, key: str, value: str | list):
         """Adds the key and value to the yaml string, double tabbed
@@ -246,7 +300,7 @@ class BoltzYaml:
             str: yaml string
         """
         value = f'"{value}"' if isinstance(value, str) else value
-        return f"{DELIM}{DELIM}{key}: {value}\n"
+        return f"{DOUBLE_DELIM}{key}: {value}\n"
 
     def add_ligand_information(self, ligand_dict: dict, linked_id=None):
         """
@@ -261,28 +315,30 @@ class BoltzYaml:
 
         if "ccdCodes" in ligand_dict and len(ligand_dict["ccdCodes"]) == 0:
             return ""
-        yaml_string = ""
-        yaml_string += self.add_title("ligand")
-        yaml_string += self.add_id(ligand_dict["id"])
+        parts: List[str] = []
+        parts.append(self.add_title("ligand"))
+        parts.append(self.add_id(ligand_dict["id"]))
 
         if "smiles" in ligand_dict:
-            yaml_string += self.add_key_and_value("smiles", ligand_dict["smiles"])
+            parts.append(self.add_key_and_value("smiles", ligand_dict["smiles"]))
         elif "ccdCodes" in ligand_dict:
             if isinstance(ligand_dict["ccdCodes"], str):
-                yaml_string += self.add_key_and_value("ccd", ligand_dict["ccdCodes"])
+                parts.append(self.add_key_and_value("ccd", ligand_dict["ccdCodes"]))
             elif isinstance(ligand_dict["ccdCodes"], list):
                 if linked_id is not None:
 
                     self.__add_linked_ids(linked_id, ligand_dict["id"])
 
-                yaml_string += self.add_key_and_value("ccd", ligand_dict["ccdCodes"][0])
+                parts.append(self.add_key_and_value("ccd", ligand_dict["ccdCodes"][0]))
 
-                yaml_string += self.add_ligand_information(
-                    {
-                        "id": self.find_next_id(),
-                        "ccdCodes": ligand_dict["ccdCodes"][1:],
-                    },
-                    linked_id=ligand_dict["id"],
+                parts.append(
+                    self.add_ligand_information(
+                        {
+                            "id": self.find_next_id(),
+                            "ccdCodes": ligand_dict["ccdCodes"][1:],
+                        },
+                        linked_id=ligand_dict["id"],
+                    )
                 )
 
         else:
@@ -291,7 +347,7 @@ class BoltzYaml:
             logger.critical(msg)
             raise ValueError()
 
-        return yaml_string
+        return "".join(parts)
 
     def add_sequence_information(self, sequence_dict: dict):
         """
@@ -304,13 +360,9 @@ class BoltzYaml:
         Returns:
             str: yaml string
         """
-        yaml_string = ""
-        yaml_string += self.add_id(sequence_dict["id"])
-        yaml_string += (
-            self.add_sequence(sequence_dict["sequence"])
-            if "sequence" in sequence_dict
-            else ""
-        )
+        parts: List[str] = [self.add_id(sequence_dict["id"])]
+        if "sequence" in sequence_dict:
+            parts.append(self.add_sequence(sequence_dict["sequence"]))
         if isinstance(sequence_dict["id"], str):
             id_ = [sequence_dict["id"]]
         else:
@@ -319,17 +371,15 @@ class BoltzYaml:
         self.__non_ligands.extend(id_)
 
         if self.msa_file is not None:
-            (
+            if self.__create_files and self.msa_file not in self.__written_msas:
                 self.msa_to_file(sequence_dict["unpairedMsa"], self.msa_file)
-                if self.__create_files
-                else None
-            )
-            yaml_string += self.add_msa(self.msa_file)
+                self.__written_msas.add(self.msa_file)
+            parts.append(self.add_msa(self.msa_file))
 
         if "modifications" in sequence_dict and sequence_dict["modifications"]:
-            yaml_string += self.add_modifications(sequence_dict["modifications"])
+            parts.append(self.add_modifications(sequence_dict["modifications"]))
 
-        return yaml_string
+        return "".join(parts)
 
     def add_title(self, name: str):
         """
@@ -354,29 +404,40 @@ class BoltzYaml:
         Returns:
             str: yaml string
         """
+        parts: List[str] = [yaml_string] if yaml_string else []
         for sequence_type, sequence_info_dict in sequence_dict.items():
-            yaml_string += self.add_title(sequence_type)
+            parts.append(self.add_title(sequence_type))
+            # The file name is derived from the sequence so identical chains
+            # share one msa file and reruns are reproducible
             self.msa_file = (
                 (
-                    Path(self.working_dir)
-                    / f"{''.join(random.choices(string.ascii_letters, k=5))}.a3m"
+                    self.working_dir
+                    / (
+                        hashlib.sha1(
+                            sequence_info_dict.get("sequence", "").encode()
+                        ).hexdigest()[:10]
+                        + ".a3m"
+                    )
                 )
                 if "unpairedMsa" in sequence_info_dict
                 else None
             )
 
-            yaml_string += self.add_sequence_information(sequence_info_dict)
+            parts.append(self.add_sequence_information(sequence_info_dict))
 
             # Special treatment for single-sequence mode (no MSA)
             if self.msa_file is None and "protein" == sequence_type:
-                yaml_string += f"{DELIM}{DELIM}msa: empty\n"
+                parts.append(f"{DOUBLE_DELIM}msa: empty\n")
 
-        return yaml_string
+        return "".join(parts)
 
     def write_yaml(self, file_path: Union[str, Path]):
         """
         Writes the yaml string to a file
 
+        The collected fragments are streamed straight to the file handle
+        when available, so the write does not copy the full document again
+
         Args:
             file_path (Union[str, Path]): file path
 
@@ -387,7 +448,10 @@ class BoltzYaml:
         assert self.yaml_string, "No yaml string to write to file"
         assert Path(file_path).suffix == ".yaml", "File must have a .yaml extension"
         with open(file_path, "w") as f:
-            f.write(self.yaml_string)
+            if self._parts:
+                f.writelines(self._parts)
+            else:
+                f.write(self.yaml_string)
 
     def find_next_id(self):
 
@@ -399,13 +463,14 @@ class BoltzYaml:
 
     def get_ids(self, sequences: list):
         for sequence in sequences:
-            for key in sequence:
-                for key2 in sequence[key]:
-                    if key2 == "id":
-                        if isinstance(sequence[key][key2], list):
-                            self.__ids.extend(sequence[key][key2])
-                            continue
-                        self.__ids.append(sequence[key][key2])
+            for entity in sequence.values():
+                ids = entity.get("id")
+                if ids is None:
+                    continue
+                if isinstance(ids, list):
+                    self.__ids.extend(ids)
+                else:
+                    self.__ids.append(ids)
 
     def __add_linked_ids(
         self, ligand_id: Union[str, int], linked_ligand_id: Union[str, int]
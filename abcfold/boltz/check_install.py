@@ -6,8 +6,15 @@ logger = logging.getLogger("logger")
 
 BOLTZ_VERSION = "2.2.0"
 
+# Set once check_boltz has succeeded so repeated calls within the same
+# process skip the import and pip probe
+_checked = False
+
 
 def check_boltz():
+    global _checked
+    if _checked:
+        return
     try:
         import boltz as _  # noqa F401
 
@@ -53,15 +60,12 @@ def check_boltz():
         ]
 
         logger.info("Running %s", " ".join(cmd))
-        with subprocess.Popen(
-            cmd,
-            stdout=sys.stdout,
-            stderr=subprocess.PIPE,
-        ) as proc:
-            proc.wait()
-            if proc.returncode != 0:
-                if proc.stderr:
-                    logger.error(proc.stderr.read().decode())
-                raise subprocess.CalledProcessError(proc.returncode, proc.args)
+        try:
+            subprocess.run(cmd, stdout=sys.stdout, stderr=subprocess.PIPE, check=True)
+        except subprocess.CalledProcessError as e:
+            if e.stderr:
+                logger.error(e.stderr.decode())
+            raise
 
+    _checked = True
     logger.info(f"Running Boltz version: {BOLTZ_VERSION}")
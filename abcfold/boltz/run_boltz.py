@@ -1,5 +1,5 @@
+import asyncio
 import logging
-import subprocess
 import sys
 import tempfile
 from pathlib import Path
@@ -53,56 +53,100 @@ def run_boltz(
         boltz_yaml = BoltzYaml(working_dir)
         boltz_yaml.json_to_yaml(input_json)
 
+        # The yaml contents are identical for every seed (the seed is a CLI
+        # flag), so the document is built once and only written out per seed.
+        # Each seed keeps its own suffixed file name: Boltz derives its
+        # boltz_results_* directory from the yaml stem, and the output
+        # parsing relies on the trailing seed-N token
+        seed_cmds = []
         for seed in boltz_yaml.seeds:
             out_file = working_dir.joinpath(f"{input_json.stem}_seed-{seed}.yaml")
-
             boltz_yaml.write_yaml(out_file)
-            logger.info("Running Boltz using seed: %s", seed)
-            cmd = (
-                generate_boltz_command(
-                    out_file,
-                    output_dir,
-                    number_of_models,
-                    num_recycles,
-                    seed=seed,
+            seed_cmds.append(
+                (
+                    seed,
+                    generate_boltz_command(
+                        out_file,
+                        output_dir,
+                        number_of_models,
+                        num_recycles,
+                        seed=seed,
+                    )
+                    if not test
+                    else generate_boltz_test_command(),
                 )
-                if not test
-                else generate_boltz_test_command()
             )
 
-            with subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-            ) as proc:
-                stdout = ""
-                if proc.stdout:
-                    for line in proc.stdout:
-                        sys.stdout.write(line.decode())
-                        sys.stdout.flush()
-                        stdout += line.decode()
-                _, stderr = proc.communicate()
-                if proc.returncode != 0:
-                    if proc.stderr:
-                        logger.error(stderr.decode())
-                        output_err_file = output_dir / "boltz_error.log"
-                        with open(output_err_file, "w") as f:
-                            f.write(stderr.decode())
-                        logger.error(
-                            "Boltz run failed. Error log is in %s", output_err_file
-                        )
-                    else:
-                        logger.error("Boltz run failed")
-                    return False
-                elif "WARNING: ran out of memory" in stdout:
-                    logger.error("Boltz ran out of memory")
-                    return False
+        if not asyncio.run(_run_boltz_seeds(seed_cmds, output_dir)):
+            return False
 
         logger.info("Boltz run complete")
         logger.info("Output files are in %s", output_dir)
         return True
 
 
+async def _tee_stream(stream: asyncio.StreamReader) -> str:
+    """
+    Echo a subprocess stream to stdout line by line while collecting it
+
+    Args:
+        stream (asyncio.StreamReader): the stream to read
+
+    Returns:
+        str: the full stream contents
+    """
+    parts = []
+    async for line in stream:
+        decoded = line.decode()
+        sys.stdout.write(decoded)
+        sys.stdout.flush()
+        parts.append(decoded)
+    return "".join(parts)
+
+
+async def _run_boltz_seeds(seed_cmds: list, output_dir: Path) -> bool:
+    """
+    Run the Boltz command for each seed on a shared event loop
+
+    Seeds are run one after another (they share the GPU and the output
+    directory), but stdout and stderr are drained concurrently with
+    non-blocking reads so neither pipe can fill up and stall Boltz
+
+    Args:
+        seed_cmds (list): list of (seed, command) tuples
+        output_dir (Path): Path to the output directory
+
+    Returns:
+        bool: True if every seed ran successfully, False otherwise
+    """
+    for seed, cmd in seed_cmds:
+        logger.info("Running Boltz using seed: %s", seed)
+        proc = await asyncio.create_subprocess_exec(
+            *[str(arg) for arg in cmd],
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        assert proc.stdout is not None and proc.stderr is not None
+        stdout, stderr_bytes = await asyncio.gather(
+            _tee_stream(proc.stdout), proc.stderr.read()
+        )
+        await proc.wait()
+        if proc.returncode != 0:
+            if stderr_bytes:
+                logger.error(stderr_bytes.decode())
+                output_err_file = output_dir / "boltz_error.log"
+                with open(output_err_file, "w") as f:
+                    f.write(stderr_bytes.decode())
+                logger.error("Boltz run failed. Error log is in %s", output_err_file)
+            else:
+                logger.error("Boltz run failed")
+            return False
+        elif "WARNING: ran out of memory" in stdout:
+            logger.error("Boltz ran out of memory")
+            return False
+    return True
+
+
 def generate_boltz_command(
     input_yaml: Union[str, Path],
     output_dir: Union[str, Path],
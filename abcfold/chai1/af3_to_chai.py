@@ -1,3 +1,4 @@
+import csv
 import hashlib
 import json
 import logging
@@ -5,10 +6,10 @@ import tempfile
 from pathlib import Path
 from typing import Dict, List, Optional, Union
 
-import numpy as _  # noqa F401
-import pandas as pd
-import pyarrow as _  # noqa F401
-import requests
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from abcfold.output.atoms import VANDERWALLS
 
@@ -16,11 +17,41 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-ATOMS_NAMES = sorted(list(VANDERWALLS.keys()), key=len, reverse=True)
+ATOMS_NAMES: tuple = tuple(sorted(VANDERWALLS, key=len, reverse=True))
+
+
+def _build_atom_name_trie(names) -> dict:
+    """
+    Build a character trie over the known atom names
+
+    Terminal nodes store the matched name under "$", so a walk over an
+    atom string yields the longest known prefix in O(len(atom))
+
+    Args:
+        names: iterable of atom names
+
+    Returns:
+        dict: nested dict trie
+    """
+    trie: dict = {}
+    for name in names:
+        node = trie
+        for char in name:
+            node = node.setdefault(char, {})
+        node["$"] = name
+    return trie
+
+
+_ATOM_NAME_TRIE = _build_atom_name_trie(VANDERWALLS)
 
 
 class ChaiFasta:
 
+    # Shared across instances: CCD codes map to fixed SMILES, and a single
+    # Session reuses the HTTP connection between lookups
+    _session = None
+    _smiles_cache: Dict[str, Optional[str]] = {}
+
     def __init__(self, working_dir: Union[str, Path], create_files: bool = True):
         """
         Object to convert an AlphaFold3 json to a fasta file compatible with CHAI-1
@@ -43,6 +74,7 @@ class ChaiFasta:
         self.seeds: list = [42]
         self.__ids: List[Union[str, int]] = []
         self.__create_files = create_files
+        self._seq_hash_cache: Dict[str, str] = {}
 
     @property
     def chain_ids(self):
@@ -72,13 +104,15 @@ class ChaiFasta:
             "comment",
             "restraint_id",
         ]
-        df = pd.DataFrame(columns=constraints_headers)
+        rows: List[list] = []
 
         for i, bonded_pair in enumerate(bonded_pairs):
             pair_data = []
+            seq_a = fasta_data[bonded_pair[0][0]]
+            seq_b = fasta_data[bonded_pair[1][0]]
             if (
-                fasta_data[bonded_pair[0][0]] == "CCD-CODE_PLACEHOLDER"
-                or fasta_data[bonded_pair[1][0]] == "CCD-CODE_PLACEHOLDER"
+                seq_a == "CCD-CODE_PLACEHOLDER"
+                or seq_b == "CCD-CODE_PLACEHOLDER"
             ):
                 logger.warning(
                     "Currently Chai-1 does not support most ccdcode ligands\
@@ -87,8 +121,8 @@ class ChaiFasta:
                 )
                 continue
             if (
-                fasta_data[bonded_pair[0][0]] == "LIGAND_PLACEHOLDER"
-                or fasta_data[bonded_pair[1][0]] == "LIAGND_PLACEHOLDER"
+                seq_a == "LIGAND_PLACEHOLDER"
+                or seq_b == "LIAGND_PLACEHOLDER"
             ):
                 logger.warning(
                     "SMILES Ligand bonded paris are not implemented yet, please \
@@ -96,31 +130,35 @@ check back for updates"
                 )
                 continue
 
-            for pair in bonded_pair:
+            for pair, seq in zip(bonded_pair, (seq_a, seq_b)):
 
                 chain_id = pair[0]
                 seq_idx = pair[1]
                 pair_data.append(chain_id)
-                res = fasta_data[chain_id][seq_idx - 1]
+                res = seq[seq_idx - 1]
 
                 pair_data.append(f"{res}{seq_idx}@{pair[2]}")
 
-            row_data = [
-                pair_data[0],
-                pair_data[1],
-                pair_data[2],
-                pair_data[3],
-                "contact",
-                1.0,
-                0.0,
-                5.5,
-                "Covalent Bond",
-                f"restraint_{i}",
-            ]
-            df.loc[i] = row_data
+            rows.append(
+                [
+                    pair_data[0],
+                    pair_data[1],
+                    pair_data[2],
+                    pair_data[3],
+                    "contact",
+                    1.0,
+                    0.0,
+                    5.5,
+                    "Covalent Bond",
+                    f"restraint_{i}",
+                ]
+            )
 
-        if not df.empty and self.__create_files:
-            df.to_csv(self.constraints, sep=",", index=False)
+        if rows and self.__create_files:
+            with open(self.constraints, "w", newline="") as f:
+                writer = csv.writer(f, lineterminator="\n")
+                writer.writerow(constraints_headers)
+                writer.writerows(rows)
 
     def msa_to_file(self, msa: str, file_path: Union[str, Path]):
         """
@@ -146,8 +184,13 @@ install chai_lab'"
             )
             raise ImportError()
 
-        # Convert msa to CHAI-1 format with additional MSA source information
-        with tempfile.NamedTemporaryFile(suffix=".a3m", mode="w") as f:
+        # Convert msa to CHAI-1 format with additional MSA source information.
+        # chai_lab only accepts file paths, so stage the a3m in tmpfs when
+        # available to keep the round-trip off disk
+        shm = Path("/dev/shm")
+        with tempfile.NamedTemporaryFile(
+            suffix=".a3m", mode="w", dir=shm if shm.is_dir() else None
+        ) as f:
             f.write(msa)
             f.flush()
             df = merge_multi_a3m_to_aligned_dataframe(
@@ -173,31 +216,39 @@ install chai_lab'"
         """
         logger.info("Converting input json to a Chai-1 compatible fasta file")
         if isinstance(json_file_or_dict, str) or isinstance(json_file_or_dict, Path):
-            with open(json_file_or_dict, "r") as f:
-                json_dict = json.load(f)
+            if orjson is not None:
+                json_dict = orjson.loads(Path(json_file_or_dict).read_bytes())
+            else:
+                with open(json_file_or_dict, "r") as f:
+                    json_dict = json.load(f)
         else:
             json_dict = json_file_or_dict
 
         fasta_data: Dict[str, str] = {}
 
-        with open(self.fasta, "w") as f:
-            for seq in json_dict["sequences"]:
-                if "protein" in seq:
-                    protein_str, fasta_data = self.add_protein(seq, fasta_data)
-                    f.write(protein_str)
-                if "rna" in seq:
-                    nucleotide_str, fasta_data = self.add_nucleotide(
-                        seq, "rna", fasta_data
-                    )
-                    f.write(nucleotide_str)
-                if "dna" in seq:
-                    nucleotide_str, fasta_data = self.add_nucleotide(
-                        seq, "dna", fasta_data
-                    )
-                    f.write(nucleotide_str)
-                if "ligand" in seq:
-                    ligand_str = self.add_ligand(seq, fasta_data)
-                    f.write(ligand_str)
+        parts: List[str] = []
+        for seq in json_dict["sequences"]:
+            if "protein" in seq:
+                protein_str, fasta_data = self.add_protein(seq, fasta_data)
+                parts.append(protein_str)
+            if "rna" in seq:
+                nucleotide_str, fasta_data = self.add_nucleotide(
+                    seq, "rna", fasta_data
+                )
+                parts.append(nucleotide_str)
+            if "dna" in seq:
+                nucleotide_str, fasta_data = self.add_nucleotide(
+                    seq, "dna", fasta_data
+                )
+                parts.append(nucleotide_str)
+            if "ligand" in seq:
+                ligand_str = self.add_ligand(seq, fasta_data)
+                parts.append(ligand_str)
+
+        # Emit everything in one writelines through a large buffer rather
+        # than one syscall-prone write per chain
+        with open(self.fasta, "w", buffering=1 << 20) as f:
+            f.writelines(parts)
 
         if "bondedAtomPairs" in json_dict.keys() and self.__create_files:
             if isinstance(json_dict["bondedAtomPairs"], list):
@@ -217,31 +268,36 @@ install chai_lab'"
 
     def add_protein(self, seq: dict, fasta_data: dict):
         prot_id = seq["protein"]["id"]
-        if isinstance(prot_id, list):
-            protein_str = ""
-            for i in seq["protein"]["id"]:
-                temp_prot_str, fasta_data = self._add_protein(seq, i, fasta_data)
-                protein_str += temp_prot_str
-        else:
-            protein_str, fasta_data = self._add_protein(seq, prot_id, fasta_data)
+        protein_str = ""
+        for i in self._normalise_ids(prot_id):
+            temp_prot_str, fasta_data = self._add_protein(seq, i, fasta_data)
+            protein_str += temp_prot_str
         return protein_str, fasta_data
 
+    @staticmethod
+    def _normalise_ids(ids) -> tuple:
+        """Return the chain id(s) as a tuple, whether one id or a list."""
+        return tuple(ids) if isinstance(ids, (list, tuple)) else (ids,)
+
     def _add_protein(self, seq: dict, prot_id: str, fasta_data: dict):
-        sequence = seq["protein"]["sequence"]
-        if "unpairedMsa" in seq["protein"].keys():
-            seq_hash = hashlib.sha256(sequence.upper().encode()).hexdigest()
+        seq_protein = seq["protein"]
+        sequence = seq_protein["sequence"]
+        if "unpairedMsa" in seq_protein.keys():
+            # Homomeric chains share a sequence, so hash each unique
+            # sequence once and only write its parquet MSA the first time
+            seq_hash = self._seq_hash_cache.get(sequence)
+            if seq_hash is None:
+                seq_hash = hashlib.sha256(sequence.upper().encode()).hexdigest()
+                self._seq_hash_cache[sequence] = seq_hash
             pqt_path = Path(self.working_dir) / f"{seq_hash}.aligned.pqt"
-            msa = seq["protein"]["unpairedMsa"]
+            msa = seq_protein["unpairedMsa"]
 
-            (
+            if self.__create_files and not pqt_path.exists():
                 self.msa_to_file(msa=msa, file_path=pqt_path)
-                if self.__create_files
-                else None
-            )
         fasta_data[prot_id] = sequence
 
-        if "modifications" in seq["protein"]:
-            sequence = self.add_modifications(sequence, seq["protein"]["modifications"])
+        if "modifications" in seq_protein:
+            sequence = self.add_modifications(sequence, seq_protein["modifications"])
 
         protein_str = f">protein|{prot_id}\n{sequence}\n"
 
@@ -250,27 +306,23 @@ install chai_lab'"
     def add_nucleotide(self, seq: dict, seq_type: str, fasta_data: dict):
         nucl_id = seq[seq_type]["id"]
 
-        if isinstance(nucl_id, list):
-            nucleotide_str = ""
-            for i in seq[seq_type]["id"]:
-                temp_nucl_str, fasta_data = self._add_nucleotide(
-                    seq, seq_type, i, fasta_data
-                )
-                nucleotide_str += temp_nucl_str
-        else:
-            nucleotide_str, fasta_data = self._add_nucleotide(
-                seq, seq_type, nucl_id, fasta_data
+        nucleotide_str = ""
+        for i in self._normalise_ids(nucl_id):
+            temp_nucl_str, fasta_data = self._add_nucleotide(
+                seq, seq_type, i, fasta_data
             )
+            nucleotide_str += temp_nucl_str
 
         return nucleotide_str, fasta_data
 
     def _add_nucleotide(self, seq: dict, seq_type: str, nucl_id: str, fasta_data: dict):
-        sequence = seq[seq_type]["sequence"]
+        seq_nucl = seq[seq_type]
+        sequence = seq_nucl["sequence"]
         fasta_data[nucl_id] = sequence
 
-        if "modifications" in seq[seq_type]:
+        if "modifications" in seq_nucl:
             sequence = self.add_modifications(
-                sequence, seq[seq_type]["modifications"]
+                sequence, seq_nucl["modifications"]
             )
 
         nucleotide_str = f">{seq_type}|{nucl_id}\n{sequence}\n"
@@ -279,31 +331,36 @@ install chai_lab'"
     def ccd_to_smiles(self, ccd_id: str):
 
         assert isinstance(ccd_id, str), "CCD ID must be a string"
+        if ccd_id in self._smiles_cache:
+            return self._smiles_cache[ccd_id]
         logger.info(f"CCD code found in input: {ccd_id}")
         logger.info("Chai-1 currently only supports SMILES strings for ligands")
         logger.info("Attempting to retrieve SMILES from CCD")
         url = f"http://cactus.nci.nih.gov/chemical/structure/{ccd_id}/smiles"
-        response = requests.get(url)
+        if ChaiFasta._session is None:
+            import requests
+
+            ChaiFasta._session = requests.Session()
+        response = ChaiFasta._session.get(url, timeout=10)
         if response.status_code == 200:
             ccd_data = response.text
             logger.info(f"SMILES retrieved: {ccd_data}")
-            return ccd_data
         else:
             logger.warning(f"Could not retrieve SMILES for {ccd_id}")
-            return None
+            ccd_data = None
+        self._smiles_cache[ccd_id] = ccd_data
+        return ccd_data
 
     def add_ligand(self, seq: dict, fasta_data: dict):
-        lig_id = seq["ligand"]["id"]
+        seq_ligand = seq["ligand"]
+        lig_ids = self._normalise_ids(seq_ligand["id"])
         ligand_str = ""
-        if "ccdCodes" in seq["ligand"]:
-            if isinstance(lig_id, str):
-                lig_id = [lig_id]
-
-            for lig in lig_id:
-                if isinstance(seq["ligand"]["ccdCodes"], str):
-                    ccd_codes = [seq["ligand"]["ccdCodes"]]
-                else:
-                    ccd_codes = seq["ligand"]["ccdCodes"]
+        if "ccdCodes" in seq_ligand:
+            if isinstance(seq_ligand["ccdCodes"], str):
+                ccd_codes = [seq_ligand["ccdCodes"]]
+            else:
+                ccd_codes = seq_ligand["ccdCodes"]
+            for lig in lig_ids:
                 ligand_str += (
                     f">protein|{lig}\n{''.join([f'({ccd})' for ccd in ccd_codes])}\n"
                 )
@@ -329,14 +386,11 @@ install chai_lab'"
             #     smile = self.ccd_to_smiles(ccd_code)
             #     if smile:
             #         ligand_str = f">ligand|{lig_id}\n{smile}\n"
-        if "smiles" in seq["ligand"]:
-            if isinstance(lig_id, list):
-                for i in seq["ligand"]["id"]:
-                    ligand_str += f">ligand|{i}\n{seq['ligand']['smiles']}\n"
-                    fasta_data[i] = "SMILES_PLACEHOLDER"
-            else:
-                ligand_str = f">ligand|{lig_id}\n{seq['ligand']['smiles']}\n"
-                fasta_data[lig_id] = "SMILES_PLACEHOLDER"
+        if "smiles" in seq_ligand:
+            smiles = seq_ligand["smiles"]
+            for i in lig_ids:
+                ligand_str += f">ligand|{i}\n{smiles}\n"
+                fasta_data[i] = "SMILES_PLACEHOLDER"
 
         return ligand_str
 
@@ -352,21 +406,35 @@ install chai_lab'"
             sequence (str): the sequence with modifications added
         """
 
-        sequence_list = list(sequence)
+        # Patch the few modified positions with slices instead of expanding
+        # the whole sequence into per-character strings; a dict keeps the
+        # last modification when a position is given twice
+        replacements: Dict[int, str] = {}
         for mod in modifications:
             if "ptmType" in mod and "ptmPosition" in mod:
-                ptm_type = mod['ptmType']
-                position = int(mod['ptmPosition']) - 1
-                sequence_list[position] = f"({ptm_type})"
+                replacements[int(mod['ptmPosition']) - 1] = f"({mod['ptmType']})"
             elif "modificationType" in mod and "basePosition" in mod:
-                mod_type = mod['modificationType']
-                position = int(mod['basePosition']) - 1
-                sequence_list[position] = f"({mod_type})"
+                replacements[int(mod['basePosition']) - 1] = (
+                    f"({mod['modificationType']})"
+                )
+
+        parts = []
+        prev = 0
+        for position in sorted(replacements):
+            parts.append(sequence[prev:position])
+            parts.append(replacements[position])
+            prev = position + 1
+        parts.append(sequence[prev:])
 
-        return ''.join(sequence_list)
+        return ''.join(parts)
 
     def get_atom_name(self, atom: str) -> str:
-        for name in ATOMS_NAMES:
-            if atom.startswith(name):
-                return name
-        return ""
+        node = _ATOM_NAME_TRIE
+        match = ""
+        for char in atom:
+            node = node.get(char)
+            if node is None:
+                break
+            if "$" in node:
+                match = node["$"]
+        return match
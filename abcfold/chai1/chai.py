@@ -59,6 +59,7 @@ def run_inference_wrapper(
     seed: int | None = None,
     device: str | None = None,
     low_memory: bool = True,
+    pae_dtype: str = "float16",
 ):
 
     result = run_inference(
@@ -81,7 +82,15 @@ def run_inference_wrapper(
         low_memory=low_memory,
     )
 
-    np.save(f"{output_dir}/pae_scores.npy", result.pae)
+    pae = result.pae
+    if hasattr(pae, "detach"):
+        # torch tensor: move to host memory once before serializing
+        pae = pae.detach().cpu().contiguous().numpy()
+    if pae_dtype != "float32":
+        # PAE values span [0, ~32] with ~0.25 resolution, so half
+        # precision loses nothing of interest and halves the file size
+        pae = pae.astype(np.float16, copy=False)
+    np.save(f"{output_dir}/pae_scores.npy", pae, allow_pickle=False)
     return result
 
 
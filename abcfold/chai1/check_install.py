@@ -1,4 +1,6 @@
+import importlib.metadata
 import logging
+import shutil
 import subprocess
 import sys
 
@@ -6,38 +8,28 @@ logger = logging.getLogger("logger")
 
 
 CHAI_VERSION = "0.6.1"
-CHAI_VERSION = "0.6.1"
+
+# Set once check_chai1 has succeeded so repeated calls within the same
+# process skip the import and metadata probe
+_checked = False
 
 
 def check_chai1():
+    global _checked
+    if _checked:
+        return
     try:
         import chai_lab as _  # noqa F40
 
-        cmd = [sys.executable, "-m", "pip", "show", "chai_lab"]
-        with subprocess.Popen(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        ) as proc:
-            stdout, stderr = proc.communicate()
-            if proc.returncode != 0:
-                if "Package(s) not found:" in stderr.decode():
-
-                    raise ModuleNotFoundError(
-                        "Chai_lab package not found."
-                    )
-                raise subprocess.CalledProcessError(proc.returncode, cmd, stderr)
-
-            version = None
-            for line in stdout.decode().split("\n"):
-                if line.startswith("Version:"):
-                    version = line.split(":", 1)[1].strip()
-                    break
+        try:
+            version = importlib.metadata.version("chai_lab")
+        except importlib.metadata.PackageNotFoundError:
+            raise ModuleNotFoundError("Chai_lab package not found.")
 
-            if version != CHAI_VERSION:
-                raise ImportError(
-                    f"Expected Chai-1 version {CHAI_VERSION}, found {version}"
-                )
+        if version != CHAI_VERSION:
+            raise ImportError(
+                f"Expected Chai-1 version {CHAI_VERSION}, found {version}"
+            )
     except (ImportError, ModuleNotFoundError):
         try:
             import boltz as _  # noqa F401
@@ -47,23 +39,24 @@ def check_chai1():
             no_deps = False
         logger.info("Installing chai_lab package")
         logger.info("No dependencies will be installed") if no_deps else None
-        cmd = [
-            sys.executable,
-            "-m",
-            "pip",
-            "install",
+        # uv resolves and downloads in parallel, so prefer it when on PATH;
+        # --python pins the install to this interpreter's environment
+        uv_exe = shutil.which("uv")
+        if uv_exe is not None:
+            installer = [uv_exe, "pip", "install", "--python", sys.executable]
+            no_cache_flag = "--no-cache"
+        else:
+            installer = [sys.executable, "-m", "pip", "install"]
+            no_cache_flag = "--no-cache-dir"
+        cmd = installer + [
             f"chai_lab=={CHAI_VERSION}",
-            "--no-cache-dir",
+            no_cache_flag,
         ]
         cmd.append("--no-deps") if no_deps else None
         logger.info("Running %s", " ".join(cmd))
         run_command_using_sys(cmd)
         if no_deps:
-            cmd = [
-                sys.executable,
-                "-m",
-                "pip",
-                "install",
+            cmd = installer + [
                 "antipickle",
                 "typer",
                 "jaxtyping",
@@ -80,19 +73,22 @@ def check_chai1():
             "Please install it using `pip install chai_lab`."
         ) from e
 
+    _checked = True
     logger.info(f"Running Chai version: {CHAI_VERSION}")
 
 
 def run_command_using_sys(command: list[str]) -> None:
     """Run a command using sys.executable."""
     logger.info("Running command: %s", " ".join(command))
-    with subprocess.Popen(
-        command,
-        stdout=sys.stdout,
-        stderr=subprocess.PIPE,
-    ) as proc:
-        proc.wait()
-        if proc.returncode != 0:
-            if proc.stderr:
-                logger.error(proc.stderr.read().decode())
-            raise subprocess.CalledProcessError(proc.returncode, proc.args)
+    try:
+        subprocess.run(
+            command,
+            stdout=sys.stdout,
+            stderr=subprocess.PIPE,
+            bufsize=65536,
+            check=True,
+        )
+    except subprocess.CalledProcessError as e:
+        if e.stderr:
+            logger.error(e.stderr.decode())
+        raise
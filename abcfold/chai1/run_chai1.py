@@ -1,8 +1,10 @@
+import asyncio
+import functools
 import logging
 import shutil
-import subprocess
 import sys
 import tempfile
+import traceback
 from pathlib import Path
 from typing import Union
 
@@ -12,6 +14,12 @@ from abcfold.chai1.check_install import check_chai1
 logger = logging.getLogger("logger")
 
 
+@functools.lru_cache(maxsize=1)
+def _kalign_available() -> bool:
+    """Whether kalign is on PATH; cached to avoid repeated PATH scans."""
+    return shutil.which("kalign") is not None
+
+
 def run_chai(
     input_json: Union[str, Path],
     output_dir: Union[str, Path],
@@ -60,51 +68,136 @@ def run_chai(
         msa_dir = chai_fasta.working_dir
         out_constraints = chai_fasta.constraints
 
-        for seed in chai_fasta.seeds:
-            chai_output_dir = output_dir / f"chai_output_seed-{seed}"
+        if test:
+            seed_cmds = [
+                (seed, generate_chai_test_command()) for seed in chai_fasta.seeds
+            ]
+            if not asyncio.run(_run_chai_seeds(seed_cmds, output_dir)):
+                return False
+        else:
+            # Call the inference wrapper in-process so the interpreter
+            # startup, torch import, CUDA context and model weight load are
+            # paid once and shared across every seed. Imported lazily as
+            # chai_lab is only installed on demand by check_chai1
+            from abcfold.chai1.chai import run_inference_wrapper
 
-            logger.info(f"Running Chai-1 using seed {seed}")
-            cmd = (
-                generate_chai_command(
-                    out_fasta,
-                    msa_dir,
-                    out_constraints,
-                    chai_output_dir,
-                    number_of_models,
-                    num_recycles=num_recycles,
-                    seed=seed,
-                    use_templates_server=use_templates_server,
-                    template_hits_path=template_hits_path,
+            assert not (
+                use_templates_server and template_hits_path
+            ), "Cannot specify both templates server and path"
+
+            if not _kalign_available() and (
+                use_templates_server or template_hits_path
+            ):
+                logger.warning(
+                    "kalign not found, skipping template search kalign is required. \
+Please install kalign to use templates with Chai-1."
                 )
-                if not test
-                else generate_chai_test_command()
+                use_templates_server = False
+                template_hits_path = None
+
+            # The same two paths are checked for every seed; stat them once.
+            # Both already come out of ChaiFasta as Path objects
+            msa_directory = msa_dir if msa_dir.exists() else None
+            constraint_path = (
+                out_constraints if out_constraints.exists() else None
             )
 
-            with subprocess.Popen(
-                cmd,
-                stdout=sys.stdout,
-                stderr=subprocess.PIPE,
-            ) as proc:
-                _, stderr = proc.communicate()
-                if proc.returncode != 0:
-                    if proc.stderr:
-                        if chai_output_dir.exists():
-                            output_err_file = chai_output_dir / "chai_error.log"
-                        else:
-                            output_err_file = chai_output_dir.parent / "chai_error.log"
-                        with open(output_err_file, "w") as f:
-                            f.write(stderr.decode())
-                        logger.error(
-                            "Chai-1 run failed. Error log is in %s", output_err_file
-                        )
+            # Everything except the seed and output directory is identical
+            # across seeds, so build the argument set once
+            inference_kwargs = {
+                "msa_directory": msa_directory,
+                "constraint_path": constraint_path,
+                "num_trunk_recycles": num_recycles,
+                "num_diffn_samples": number_of_models,
+                "use_templates_server": use_templates_server,
+                "template_hits_path": template_hits_path,
+            }
+
+            for seed in chai_fasta.seeds:
+                chai_output_dir = output_dir / f"chai_output_seed-{seed}"
+                logger.info(f"Running Chai-1 using seed {seed}")
+                try:
+                    run_inference_wrapper(
+                        out_fasta,
+                        output_dir=chai_output_dir,
+                        seed=seed,
+                        **inference_kwargs,
+                    )
+                except Exception:
+                    if chai_output_dir.exists():
+                        output_err_file = chai_output_dir / "chai_error.log"
                     else:
-                        logger.error("Chai-1 run failed")
+                        output_err_file = chai_output_dir.parent / "chai_error.log"
+                    with open(output_err_file, "w") as f:
+                        f.write(traceback.format_exc())
+                    logger.error(
+                        "Chai-1 run failed. Error log is in %s", output_err_file
+                    )
                     return False
 
         logger.info("Chai-1 run complete")
         return True
 
 
+async def _run_chai_seeds(
+    seed_cmds: list, output_dir: Path, max_parallel: int = 1
+) -> bool:
+    """
+    Run the Chai-1 command for each seed on a shared event loop
+
+    Seeds are independent, so up to max_parallel of them run concurrently
+    (guarded by a semaphore); the first failure cancels any seeds still
+    pending
+
+    Args:
+        seed_cmds (list): list of (seed, command) tuples
+        output_dir (Path): Path to the output directory
+        max_parallel (int): Number of seeds to run concurrently
+
+    Returns:
+        bool: True if every seed ran successfully, False otherwise
+    """
+    if not seed_cmds:
+        return True
+
+    semaphore = asyncio.Semaphore(max_parallel)
+
+    async def _run_one(seed, cmd):
+        async with semaphore:
+            chai_output_dir = output_dir / f"chai_output_seed-{seed}"
+            logger.info(f"Running Chai-1 using seed {seed}")
+            proc = await asyncio.create_subprocess_exec(
+                *[str(arg) for arg in cmd],
+                stdout=sys.stdout,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            # stdout goes straight to the terminal, so communicate only
+            # has to drain stderr and cannot deadlock on a full pipe
+            _, stderr = await proc.communicate()
+            if proc.returncode != 0:
+                if stderr:
+                    if chai_output_dir.exists():
+                        output_err_file = chai_output_dir / "chai_error.log"
+                    else:
+                        output_err_file = chai_output_dir.parent / "chai_error.log"
+                    with open(output_err_file, "w") as f:
+                        f.write(stderr.decode())
+                    logger.error(
+                        "Chai-1 run failed. Error log is in %s", output_err_file
+                    )
+                else:
+                    logger.error("Chai-1 run failed")
+                raise RuntimeError(f"Chai-1 run failed for seed {seed}")
+
+    tasks = [asyncio.create_task(_run_one(seed, cmd)) for seed, cmd in seed_cmds]
+    done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+    return all(task.exception() is None for task in done)
+
+
 def generate_chai_command(
     input_fasta: Union[str, Path],
     msa_dir: Union[str, Path],
@@ -135,12 +228,15 @@ def generate_chai_command(
 
     """
 
+    msa_dir = Path(msa_dir)
+    input_constraints = Path(input_constraints)
+
     chai_exe = Path(__file__).parent / "chai.py"
     cmd = ["python", str(chai_exe), "fold", str(input_fasta)]
 
-    if Path(msa_dir).exists():
+    if msa_dir.exists():
         cmd += ["--msa-directory", str(msa_dir)]
-    if Path(input_constraints).exists():
+    if input_constraints.exists():
         cmd += ["--constraint-path", str(input_constraints)]
 
     cmd += ["--num-diffn-samples", str(number_of_models)]
@@ -151,7 +247,7 @@ def generate_chai_command(
         use_templates_server and template_hits_path
     ), "Cannot specify both templates server and path"
 
-    if shutil.which("kalign") is None and (use_templates_server or template_hits_path):
+    if not _kalign_available() and (use_templates_server or template_hits_path):
         logger.warning(
             "kalign not found, skipping template search kalign is required. \
 Please install kalign to use templates with Chai-1."
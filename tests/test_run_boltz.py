@@ -1,8 +1,11 @@
+import json
 import os
 import tempfile
+from pathlib import Path
 
 import pytest
 
+import abcfold.boltz.run_boltz
 from abcfold.boltz.run_boltz import generate_boltz_command, run_boltz
 
 
@@ -22,6 +25,43 @@ def test_run_boltz(test_data):
             assert False
 
 
+def test_run_boltz_per_seed_results_dirs(test_data, monkeypatch):
+
+    captured = {}
+
+    async def fake_run_seeds(seed_cmds, output_dir):
+        captured["seed_cmds"] = seed_cmds
+        return True
+
+    monkeypatch.setattr(abcfold.boltz.run_boltz, "check_boltz", lambda: None)
+    monkeypatch.setattr(abcfold.boltz.run_boltz, "_run_boltz_seeds", fake_run_seeds)
+
+    with open(test_data.test_inputA_json) as f:
+        input_dict = json.load(f)
+    input_dict["modelSeeds"] = [1, 2]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        input_json = Path(temp_dir) / "inputA.json"
+        with open(input_json, "w") as f:
+            json.dump(input_dict, f)
+
+        assert run_boltz(input_json, temp_dir, save_input=True)
+
+        seed_cmds = captured["seed_cmds"]
+        assert [seed for seed, _ in seed_cmds] == [1, 2]
+
+        # Boltz names its results directory boltz_results_<yaml stem>, so
+        # every seed needs its own seed-suffixed yaml or later seeds
+        # overwrite earlier ones
+        results_dirs = set()
+        for seed, cmd in seed_cmds:
+            input_yaml = Path(cmd[2])
+            assert input_yaml.exists()
+            assert input_yaml.stem.endswith(f"_seed-{seed}")
+            results_dirs.add(f"boltz_results_{input_yaml.stem}")
+        assert len(results_dirs) == len(seed_cmds)
+
+
 def test_generate_boltz_command():
     input_yaml = "/road/to/nowhere.yaml"
     output_dir = "/road/to/nowhere"